@@ -1,11 +1,25 @@
+import calendar
+import json
 import os
+import queue
+import re
 import sqlite3
 import socket
+import threading
+import time
 from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from contextlib import closing
-from datetime import datetime, timezone
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Any, Iterable
-from flask import Flask, jsonify, request, send_from_directory, g
+from flask import Flask, Response, current_app, jsonify, request, send_from_directory, stream_with_context, g
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    # Optional fast JSON encoder; Flask's default provider is used without it
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deploy environment
+    orjson = None
 
 
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -16,7 +30,45 @@ DATABASE_URL = os.environ.get('DATABASE_URL')
 # Optional envs to help problematic networks
 PG_FORCE_POOLER = os.environ.get('PG_FORCE_POOLER', 'false').lower() in ('1', 'true', 'yes')
 PG_HOSTADDR_ENV = os.environ.get('PG_HOSTADDR')  # e.g., IPv4 literal for your DB host
+# psycopg prepare_threshold override (integer, or 'none' to disable server-side prepares)
+PG_PREPARE_THRESHOLD_ENV = os.environ.get('PG_PREPARE_THRESHOLD')
 DB_MODE = 'pg' if DATABASE_URL and DATABASE_URL.startswith(('postgres://', 'postgresql://')) else 'sqlite'
+# Max idle SQLite connections kept for reuse (roughly worker threads + 1)
+SQLITE_POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE', '4'))
+_SQLITE_POOL: 'queue.LifoQueue[sqlite3.Connection]' = queue.LifoQueue(maxsize=SQLITE_POOL_SIZE)
+SQLITE_STATEMENT_CACHE = 256
+# Postgres connection pool bounds (per worker process) and how long to wait for it to open
+PG_POOL_MIN = int(os.environ.get('PG_POOL_MIN', '1'))
+PG_POOL_MAX = int(os.environ.get('PG_POOL_MAX', '10'))
+PG_POOL_TIMEOUT = float(os.environ.get('PG_POOL_TIMEOUT', '10'))
+# How long a resolved IPv4 hostaddr for the database host is reused (0 or less: resolve every time)
+PG_DNS_CACHE_TTL = float(os.environ.get('PG_DNS_CACHE_TTL', '300'))
+_PG_POOL = None
+_PG_POOL_LOCK = threading.Lock()
+# pg_advisory_xact_lock key taken by event writers (any constant unique to this app)
+_PG_EVENTS_LOCK_KEY = 0x526F6F6D6965
+# Seconds a worker trusts its in-memory roommate map before reloading (other workers may have edited it)
+ROOMMATE_CACHE_TTL = float(os.environ.get('ROOMMATE_CACHE_TTL', '5'))
+# Browser cache lifetime for static assets. They are not fingerprinted, so keep this short
+# enough that a deploy is picked up; index.html is always revalidated via its ETag.
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', '3600'))
+# Applied to every SQLite connection. journal_mode persists in the file; the rest are per-connection.
+_SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -64000',
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA foreign_keys = ON',
+    'PRAGMA busy_timeout = 5000',
+)
+# parse_iso's output shape (naive or UTC 'Z'), optionally with a fraction that normalization drops;
+# covers Date.toISOString() ('...T10:00:00.000Z') as sent by the event form
+_CANONICAL_ISO_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]+)?Z?')
+# Timestamp shapes sent by the UI: date, time (seconds/fraction optional), optional Z/offset
+_ISO_RE = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d+))?)?([+-]\d{2}:?\d{2}|Z)?$'
+)
 
 
 def _ensure_db_path_and_migrate():
@@ -39,6 +91,142 @@ def _ensure_db_path_and_migrate():
         pass
 
 
+def _datetime_from_iso_match(m: 're.Match[str]') -> datetime:
+    """Build a datetime from an _ISO_RE match; raises ValueError on out-of-range fields."""
+    grp = m.group
+    frac = grp(7)
+    micro = int(frac[:6].ljust(6, '0')) if frac else 0
+    tz = grp(8)
+    tzinfo = None
+    if tz == 'Z':
+        tzinfo = timezone.utc
+    elif tz:
+        offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[-2:]))
+        tzinfo = timezone(-offset if tz[0] == '-' else offset)
+    return datetime(
+        int(grp(1)), int(grp(2)), int(grp(3)), int(grp(4)), int(grp(5)),
+        int(grp(6)) if grp(6) else 0, micro, tzinfo,
+    )
+
+
+def _normalize_dt(dt: datetime) -> str:
+    # Normalize: timezone-aware -> UTC Z; naive -> keep as local naive string with seconds
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+        return dt.replace(microsecond=0).isoformat().replace('+00:00', 'Z')
+    return dt.replace(microsecond=0).isoformat()
+
+
+def parse_iso(ts: str) -> str:
+    """Normalize an RFC3339/ISO-8601 timestamp, with or without timezone.
+
+    Returns a normalized string; timezone inputs are normalized to UTC 'Z'.
+    Raises ValueError for anything that is not a valid timestamp string.
+    """
+    if not isinstance(ts, str) or not ts.strip():
+        raise ValueError('invalid timestamp')
+    s = ts.strip()
+    if _CANONICAL_ISO_RE.fullmatch(s):
+        # Normalized apart from any fraction: range-check the fields, skip the datetime round trip.
+        # Calendar range queries carry a local offset and take the cached path below.
+        datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]), int(s[17:19]))
+        return s[:19] + 'Z' if s[-1] == 'Z' else s[:19]
+    return _parse_iso_cached(s)
+
+
+def iso_epoch(ts: str) -> int:
+    """Epoch seconds for a parse_iso-normalized timestamp; naive values are read as UTC.
+
+    Reading naive values as UTC keeps the integer order identical to the
+    string order the normalized values had before.
+    """
+    return calendar.timegm((int(ts[0:4]), int(ts[5:7]), int(ts[8:10]), int(ts[11:13]), int(ts[14:16]), int(ts[17:19])))
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_cached(s: str) -> str:
+    # The UI re-sends the same visible range on every refetch, so memoize.
+    # Failures raise and are therefore never cached.
+    s = s.replace(' ', 'T')
+    m = _ISO_RE.match(s)
+    if m is None:
+        # Less common shapes (e.g. date only): let the stdlib parser decide
+        s = s[:-1] + '+00:00' if s.endswith('Z') else s
+        try:
+            dt = datetime.fromisoformat(s)
+        except ValueError:
+            raise ValueError('invalid ISO datetime')
+    else:
+        dt = _datetime_from_iso_match(m)
+    return _normalize_dt(dt)
+
+
+def _init_sqlite_conn(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply _SQLITE_PRAGMAS to a freshly opened connection and return it."""
+    for pragma in _SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _sqlite_connect() -> sqlite3.Connection:
+    """Open a SQLite connection configured for reuse across requests."""
+    # Pooled connections keep their compiled statements across requests; size the
+    # per-connection statement cache to hold every query shape (incl. update variants).
+    # isolation_level=None: single statements autocommit; multi-statement writes use db_begin().
+    conn = sqlite3.connect(
+        DB_PATH, check_same_thread=False, isolation_level=None, cached_statements=SQLITE_STATEMENT_CACHE
+    )
+    conn.row_factory = sqlite3.Row
+    return _init_sqlite_conn(conn)
+
+
+def _sqlite_acquire() -> sqlite3.Connection:
+    """Take an idle connection from the pool, opening a new one if none is free."""
+    try:
+        return _SQLITE_POOL.get_nowait()
+    except queue.Empty:
+        return _sqlite_connect()
+
+
+def _sqlite_release(conn: sqlite3.Connection, exception: Optional[BaseException] = None) -> None:
+    """Return a connection to the pool; close it if the pool is full or it is unusable."""
+    try:
+        if exception is not None or conn.in_transaction:
+            conn.rollback()
+        _SQLITE_POOL.put_nowait(conn)
+    except (queue.Full, sqlite3.Error):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def _reset_pools_after_fork() -> None:
+    # SQLite handles and the psycopg pool's worker threads must not be shared with a
+    # forked child (e.g. gunicorn --preload); the child starts with empty pools.
+    global _SQLITE_POOL, _PG_POOL
+    _SQLITE_POOL = queue.LifoQueue(maxsize=SQLITE_POOL_SIZE)
+    _PG_POOL = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+@lru_cache(maxsize=16)
+def _resolve_ipv4_cached(host: str, port: int, bucket: int) -> Optional[str]:
+    # bucket only ages entries out; lookup errors propagate and are not cached
+    infos = socket.getaddrinfo(host, port, family=socket.AF_INET, type=socket.SOCK_STREAM)
+    return infos[0][4][0] if infos else None
+
+
+def _resolve_ipv4(host: str, port: int) -> Optional[str]:
+    """First IPv4 address for host, reused for up to PG_DNS_CACHE_TTL seconds (<= 0 disables caching)."""
+    if PG_DNS_CACHE_TTL <= 0:
+        return _resolve_ipv4_cached.__wrapped__(host, port, 0)
+    return _resolve_ipv4_cached(host, port, int(time.monotonic() // PG_DNS_CACHE_TTL))
+
+
 def _add_ssl_and_ipv4_to_url(url: str) -> tuple[str, Optional[str]]:
     """Ensure sslmode=require in connstring and resolve IPv4 hostaddr.
 
@@ -54,11 +242,7 @@ def _add_ssl_and_ipv4_to_url(url: str) -> tuple[str, Optional[str]]:
     try:
         host = parts.hostname
         port = parts.port or 5432
-        ipv4 = None
-        if host:
-            infos = socket.getaddrinfo(host, port, family=socket.AF_INET, type=socket.SOCK_STREAM)
-            if infos:
-                ipv4 = infos[0][4][0]
+        ipv4 = _resolve_ipv4(host, port) if host else None
         return new_url, ipv4
     except Exception:
         return new_url, None
@@ -80,15 +264,13 @@ def _set_url_port(url: str, new_port: int) -> str:
     return urlunsplit((parts.scheme, netloc, parts.path, parts.query, parts.fragment))
 
 
-def _pg_connect(dsn: str, row_factory=None):
-    import psycopg
-    from psycopg.rows import dict_row
+def _pg_targets(dsn: str):
+    """Yield (url, hostaddr) pairs to try in order, resolving each lazily.
+
+    The first target forces the Supabase pooler port when configured; the
+    second is only produced for Supabase hosts not already on port 6543.
+    """
     url, ipv4 = _add_ssl_and_ipv4_to_url(dsn)
-    kwargs = {}
-    if row_factory:
-        kwargs['row_factory'] = row_factory
-    else:
-        kwargs['row_factory'] = dict_row
     # Optionally force Supabase pooler port (6543)
     try:
         parts = urlsplit(url)
@@ -99,32 +281,175 @@ def _pg_connect(dsn: str, row_factory=None):
     except Exception:
         pass
     # First attempt: as-is, prefer IPv4 if available
+    yield url, PG_HOSTADDR_ENV or ipv4
+    # Fallback: if Supabase on 5432, try pooled port 6543
     try:
-        hostaddr = PG_HOSTADDR_ENV or ipv4
-        if hostaddr:
-            return psycopg.connect(url, hostaddr=hostaddr, **kwargs)
-        return psycopg.connect(url, **kwargs)
-    except Exception as e:
-        msg = repr(e)
-        # Fallback: if Supabase on 5432, try pooled port 6543
+        parts = urlsplit(url)
+        host = parts.hostname or ''
+        port = parts.port or 5432
+        if not (host.endswith('.supabase.co') and port != 6543):
+            return
+        url2 = _set_url_port(url, 6543)
+        url2, ipv4b = _add_ssl_and_ipv4_to_url(url2)
+    except Exception:
+        return
+    yield url2, PG_HOSTADDR_ENV or ipv4b
+
+
+def _pg_prepare_threshold(url: str) -> Optional[int]:
+    """prepare_threshold for a target URL.
+
+    Pooled connections live long enough to benefit from preparing every query
+    shape on first use (0). Transaction-mode poolers such as Supabase's port
+    6543 cannot keep server-side prepared statements, so they get None (off).
+    """
+    if PG_PREPARE_THRESHOLD_ENV is not None:
+        value = PG_PREPARE_THRESHOLD_ENV.strip().lower()
+        return None if value in ('', 'none', 'off') else int(value)
+    return None if (urlsplit(url).port or 5432) == 6543 else 0
+
+
+def _pg_connect(dsn: str, row_factory=None):
+    import psycopg
+    from psycopg.rows import dict_row
+    kwargs = {'row_factory': row_factory or dict_row}
+    first_error = None
+    for url, hostaddr in _pg_targets(dsn):
+        kwargs['prepare_threshold'] = _pg_prepare_threshold(url)
         try:
-            parts = urlsplit(url)
-            host = parts.hostname or ''
-            port = parts.port or 5432
-            if host.endswith('.supabase.co') and port != 6543:
-                url2 = _set_url_port(url, 6543)
-                url2, ipv4b = _add_ssl_and_ipv4_to_url(url2)
-                hostaddr2 = PG_HOSTADDR_ENV or ipv4b
-                if hostaddr2:
-                    return psycopg.connect(url2, hostaddr=hostaddr2, **kwargs)
-                return psycopg.connect(url2, **kwargs)
-        except Exception:
-            pass
-        raise
+            if hostaddr:
+                return psycopg.connect(url, hostaddr=hostaddr, **kwargs)
+            return psycopg.connect(url, **kwargs)
+        except Exception as e:
+            first_error = first_error or e
+            # The cached address may be stale; resolve afresh for the next target
+            _resolve_ipv4_cached.cache_clear()
+    raise first_error
+
+
+def _pg_pool():
+    """Process-wide psycopg pool, opened on first use against the first reachable target.
+
+    URL rewriting, sslmode and IPv4 resolution happen once here instead of on
+    every request; connections are reused until the pool recycles them.
+    """
+    global _PG_POOL
+    with _PG_POOL_LOCK:
+        if _PG_POOL is not None:
+            return _PG_POOL
+        from psycopg.rows import dict_row
+        from psycopg_pool import ConnectionPool
+        first_error = None
+        for url, hostaddr in _pg_targets(DATABASE_URL):
+            kwargs = {'row_factory': dict_row, 'prepare_threshold': _pg_prepare_threshold(url)}
+            if hostaddr:
+                kwargs['hostaddr'] = hostaddr
+            pool = ConnectionPool(
+                url, kwargs=kwargs, min_size=PG_POOL_MIN, max_size=PG_POOL_MAX,
+                check=ConnectionPool.check_connection, open=False,
+            )
+            try:
+                pool.open(wait=True, timeout=PG_POOL_TIMEOUT)
+            except Exception as e:
+                pool.close()
+                first_error = first_error or e
+                # The cached address may be stale; resolve afresh for the next target
+                _resolve_ipv4_cached.cache_clear()
+                continue
+            _PG_POOL = pool
+            return pool
+        raise first_error
+
+
+@lru_cache(maxsize=512)
+def _adapt_sql(sql: str) -> str:
+    # Our SQL is written with SQLite-style '?' placeholders; psycopg expects '%s'.
+    # Since our SQL does not contain literal '?', a global replace is fine. The statements
+    # are a fixed set of strings, so each is converted once per process.
+    return sql.replace('?', '%s')
+
+
+def _pg_release(conn) -> None:
+    """Return a pooled Postgres connection, discarding any unfinished transaction."""
+    try:
+        conn.rollback()
+    except Exception:
+        pass
+    finally:
+        _pg_pool().putconn(conn)
+
+
+# Column order shared by every event SELECT/RETURNING; event_rows_to_dicts unpacks by position
+EVENT_COLUMNS = 'id, title, start, "end", location, notes, roommate_id'
+# Fields update_event may set; bit i of an update mask selects _EVENT_UPDATE_COLUMNS[i].
+# start/end also carry their epoch-seconds column, so they take two params each.
+_EVENT_UPDATE_COLUMNS = ('roommate_id', 'title', 'start', 'end', 'location', 'notes')
+_EVENT_UPDATE_SETS = ('roommate_id=?', 'title=?', 'start=?, start_ts=?', '"end"=?, end_ts=?', 'location=?', 'notes=?')
+
+
+@lru_cache(maxsize=64)
+def _update_event_sql(mask: int) -> str:
+    """UPDATE ... RETURNING for the field subset in mask; params go in _EVENT_UPDATE_COLUMNS order, then id."""
+    sets = ', '.join(col for i, col in enumerate(_EVENT_UPDATE_SETS) if mask >> i & 1)
+    return f'UPDATE events SET {sets} WHERE id=? RETURNING {EVENT_COLUMNS}'
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify and request.get_json use it transparently."""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_INDENT_2 if kwargs.get('indent') else 0
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of decoding to str and
+        # letting Werkzeug encode it back. Same argument handling as jsonify().
+        if args and kwargs:
+            raise TypeError('app.json.response() takes either args or kwargs, not both')
+        obj = args[0] if len(args) == 1 else (args or kwargs or None)
+        option = orjson.OPT_APPEND_NEWLINE
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and current_app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return current_app.response_class(
+            orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype
+        )
+
+
+def _json_array_stream(items: Iterable[Any], flush_bytes: int = 16384, sort_keys: bool = True):
+    """Encode an iterable as a JSON array, yielding ~flush_bytes chunks as rows arrive."""
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+
+        def dumps(obj):
+            return orjson.dumps(obj, option=option)
+    else:
+        def dumps(obj):
+            return json.dumps(obj, separators=(',', ':'), sort_keys=sort_keys).encode()
+    buf = bytearray(b'[')
+    sep = b''
+    for item in items:
+        buf += sep
+        buf += dumps(item)
+        sep = b','
+        if len(buf) >= flush_bytes:
+            yield bytes(buf)
+            buf.clear()
+    buf += b']\n'
+    yield bytes(buf)
 
 
 def create_app():
     app = Flask(__name__, static_folder='static', template_folder='templates')
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = STATIC_MAX_AGE
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
 
     # Make sure DB dir exists and migrate any legacy file on first start (SQLite only)
     if DB_MODE == 'sqlite':
@@ -133,29 +458,31 @@ def create_app():
     # DB helpers (works for SQLite and Postgres/psycopg)
     def _get_conn():
         if DB_MODE == 'sqlite':
-            conn = sqlite3.connect(DB_PATH)
-            conn.row_factory = sqlite3.Row
-            return conn
+            # Reuse pooled connections instead of reopening the file per request
+            return _sqlite_acquire()
         else:
-            # Lazy import via helper and fallback to pooler/IPv4
-            return _pg_connect(DATABASE_URL)
-
-    def _adapt_sql(sql: str) -> str:
-        # Our SQL is written with SQLite-style '?' placeholders.
-        # For Postgres (psycopg), convert to '%s'.
-        if DB_MODE == 'pg':
-            # Replace only placeholder tokens. Since our SQL does not contain literal '?', a global replace is fine.
-            return sql.replace('?', '%s')
-        return sql
-
-    def db_execute(sql: str, params: Iterable[Any] = ()):  # returns cursor
-        sql2 = _adapt_sql(sql)
+            # Pool is created lazily (with the pooler/IPv4 fallback) and shared by all requests
+            return _pg_pool().getconn()
+
+    def db_execute(sql: str, params: Iterable[Any] = (), tuples: bool = False):  # returns cursor
+        # tuples=True yields plain tuples in SELECT order, skipping per-row name lookups
+        # Both drivers take any sequence, so only copy other iterables
+        if not isinstance(params, (tuple, list)):
+            params = tuple(params)
         if DB_MODE == 'sqlite':
-            cur = g.db.execute(sql2, tuple(params))
-            return cur
-        else:
+            if not tuples:
+                return g.db.execute(sql, params)
             cur = g.db.cursor()
-            cur.execute(sql2, tuple(params))
+            cur.row_factory = None
+            return cur.execute(sql, params)
+        else:
+            sql2 = _adapt_sql(sql)
+            if tuples:
+                from psycopg.rows import tuple_row
+                cur = g.db.cursor(row_factory=tuple_row)
+            else:
+                cur = g.db.cursor()
+            cur.execute(sql2, params)
             return cur
 
     def db_query_all(sql: str, params: Iterable[Any] = ()):  # returns list of rows (dict-like)
@@ -166,30 +493,80 @@ def create_app():
         cur = db_execute(sql, params)
         return cur.fetchone()
 
+    def db_begin():
+        # SQLite runs in autocommit mode, so open the transaction explicitly and take the write
+        # lock up front; psycopg opens one implicitly on the first statement.
+        if DB_MODE == 'sqlite':
+            g.db.execute('BEGIN IMMEDIATE')
+
+    def db_lock_events():
+        # Serializes event writers for the rest of the transaction so an overlap check and the
+        # write that depends on it cannot interleave with another writer. SQLite already gets
+        # this from its single write lock; under Postgres READ COMMITTED two NOT EXISTS checks
+        # could both pass, so take a transaction-scoped advisory lock there.
+        if DB_MODE == 'pg':
+            db_execute('SELECT pg_advisory_xact_lock(?)', (_PG_EVENTS_LOCK_KEY,))
+
+    # Roommates change rarely, so events are enriched from an in-memory id -> (name, color) map
+    # instead of joining roommates on every row. Local edits invalidate it; edits made by other
+    # workers are picked up on an unknown id or after ROOMMATE_CACHE_TTL.
+    roommate_cache: dict[int, tuple[str, str]] = {}
+    roommate_cache_loaded_at = 0.0
+    roommate_cache_lock = threading.Lock()
+
+    def roommates_by_id(refresh: bool = False) -> dict[int, tuple[str, str]]:
+        nonlocal roommate_cache, roommate_cache_loaded_at
+        with roommate_cache_lock:
+            now = time.monotonic()
+            if refresh or not roommate_cache or now - roommate_cache_loaded_at > ROOMMATE_CACHE_TTL:
+                rows = db_query_all('SELECT id, name, color FROM roommates')
+                roommate_cache = {r['id']: (r['name'], r['color']) for r in rows}
+                roommate_cache_loaded_at = now
+            return roommate_cache
+
+    def roommate_for(rid) -> Optional[tuple[str, str]]:
+        # Validates a roommate id without a query; reloads once in case another worker just added it
+        if not isinstance(rid, int):
+            return None
+        rm = roommates_by_id().get(rid)
+        if rm is None:
+            rm = roommates_by_id(refresh=True).get(rid)
+        return rm
+
+    def invalidate_roommates():
+        nonlocal roommate_cache
+        with roommate_cache_lock:
+            roommate_cache = {}
+
     @app.before_request
     def before_request():
         g.db = _get_conn()
 
     @app.teardown_request
     def teardown_request(exception):
-        db = getattr(g, 'db', None)
-        if db is not None:
-            try:
-                db.close()
-            except Exception:
-                pass
+        db = g.pop('db', None)
+        if db is None:
+            return
+        if DB_MODE == 'sqlite':
+            _sqlite_release(db, exception)
+        else:
+            _pg_release(db)
 
     with app.app_context():
         init_db()
+    if DB_MODE == 'sqlite' and _SQLITE_POOL.empty():
+        # Open one long-lived connection now so the first request finds a warm pool
+        _sqlite_release(_sqlite_connect())
 
     @app.route('/')
     def index():
-        return send_from_directory(app.static_folder, 'index.html')
+        # Revalidate every time (304 when unchanged) so new asset versions are seen promptly
+        return send_from_directory(app.static_folder, 'index.html', max_age=0, conditional=True)
 
     @app.route('/api/roommates', methods=['GET'])
     def list_roommates():
-        rows = db_query_all('SELECT id, name, color FROM roommates ORDER BY id')
-        return jsonify([dict(r) for r in rows])
+        rows = db_execute('SELECT id, name, color FROM roommates ORDER BY id', tuples=True)
+        return jsonify([{'id': rid, 'name': name, 'color': color} for rid, name, color in rows])
 
     @app.route('/api/roommates', methods=['POST'])
     def add_roommate():
@@ -199,18 +576,12 @@ def create_app():
         if not name:
             return jsonify({'error': 'name is required'}), 400
         try:
-            cur = db_execute('INSERT INTO roommates(name, color) VALUES (?, ?)', (name, color))
-            # lastrowid for Postgres: RETURNING is cleaner; fallback by re-query
-            rid = None
-            if DB_MODE == 'sqlite':
-                rid = cur.lastrowid
-            else:
-                # Postgres: get id via name (unique)
-                g.db.commit()
-                row2 = db_query_one('SELECT id FROM roommates WHERE name=?', (name,))
-                rid = row2['id']
+            cur = db_execute(
+                'INSERT INTO roommates(name, color) VALUES (?, ?) RETURNING id, name, color', (name, color)
+            )
+            row = cur.fetchone()
             g.db.commit()
-            row = db_query_one('SELECT id, name, color FROM roommates WHERE id=?', (rid,))
+            invalidate_roommates()
             return jsonify(dict(row)), 201
         except Exception as e:
             # Unique violation handling for both backends
@@ -224,109 +595,98 @@ def create_app():
         data = request.get_json(force=True)
         name = data.get('name')
         color = data.get('color')
-        row = db_query_one('SELECT id FROM roommates WHERE id=?', (rid,))
-        if not row:
-            return jsonify({'error': 'not found'}), 404
+        fields = []
+        args = []
         if name is not None:
             name = name.strip()
             if not name:
                 return jsonify({'error': 'name cannot be empty'}), 400
+            fields.append('name=?')
+            args.append(name)
+        if color is not None:
+            color = color.strip()
+            if not color:
+                return jsonify({'error': 'color cannot be empty'}), 400
+            fields.append('color=?')
+            args.append(color)
+        if not fields:
+            row = db_query_one('SELECT id, name, color FROM roommates WHERE id=?', (rid,))
+        else:
+            # One UPDATE both applies the change and returns the row; no row means unknown id
             try:
-                db_execute('UPDATE roommates SET name=? WHERE id=?', (name, rid))
+                row = db_execute(
+                    f'UPDATE roommates SET {", ".join(fields)} WHERE id=? RETURNING id, name, color', (*args, rid)
+                ).fetchone()
                 g.db.commit()
             except Exception as e:
                 msg = repr(e).lower()
                 if 'unique' in msg or 'duplicate key' in msg or '23505' in msg:
                     return jsonify({'error': 'Roommate name must be unique'}), 409
                 raise
-        if color is not None:
-            color = color.strip()
-            if not color:
-                return jsonify({'error': 'color cannot be empty'}), 400
-            db_execute('UPDATE roommates SET color=? WHERE id=?', (color, rid))
-            g.db.commit()
-        row = db_query_one('SELECT id, name, color FROM roommates WHERE id=?', (rid,))
+            if row:
+                invalidate_roommates()
+        if not row:
+            return jsonify({'error': 'not found'}), 404
         return jsonify(dict(row))
 
-    def parse_iso(ts: str):
-        # Accepts RFC3339/ISO-8601 with or without timezone.
-        # Returns a normalized string; timezone inputs are normalized to UTC 'Z'.
-        if not isinstance(ts, str) or not ts.strip():
-            raise ValueError('invalid timestamp')
-        s = ts.strip().replace(' ', 'T')
-        s = s[:-1] + '+00:00' if s.endswith('Z') else s
-        try:
-            dt = datetime.fromisoformat(s)
-        except ValueError:
-            # Fallback to a few strict patterns
-            fmts = [
-                '%Y-%m-%dT%H:%M',
-                '%Y-%m-%dT%H:%M:%S',
-                '%Y-%m-%dT%H:%M:%S.%f',
-                '%Y-%m-%dT%H:%M%z',
-                '%Y-%m-%dT%H:%M:%S%z',
-                '%Y-%m-%dT%H:%M:%S.%f%z',
-            ]
-            for fmt in fmts:
-                try:
-                    dt = datetime.strptime(s, fmt)
-                    break
-                except ValueError:
+    def event_rows_to_dicts(rows):  # generator; wrap in list() when a list is needed
+        # Rows follow EVENT_COLUMNS; the dict is built inline to avoid a helper call per row
+        # Events whose roommate no longer exists are skipped, as the former JOIN did
+        roommates = roommates_by_id()
+        refreshed = False
+        for eid, title, start, end, location, notes, rid in rows:
+            rm = roommates.get(rid)
+            if rm is None:
+                if refreshed:
                     continue
-            else:
-                raise ValueError('invalid ISO datetime')
-        # Normalize: timezone-aware -> UTC Z; naive -> keep as local naive string with seconds
-        if dt.tzinfo is not None:
-            dt = dt.astimezone(timezone.utc)
-            return dt.replace(microsecond=0).isoformat().replace('+00:00', 'Z')
-        return dt.replace(microsecond=0).isoformat()
-
-    def event_row_to_dict(row):
-        return {
-            'id': row['id'],
-            'title': row['title'],
-            'start': row['start'],
-            'end': row['end'],
-            'location': row['location'],
-            'notes': row['notes'],
-            'roommate': {
-                'id': row['roommate_id'],
-                'name': row['roommate_name'],
-                'color': row['roommate_color'],
-            },
-        }
+                # Roommate may have been added by another worker since our last load; reload once per call
+                roommates = roommates_by_id(refresh=True)
+                refreshed = True
+                rm = roommates.get(rid)
+                if rm is None:
+                    continue
+            yield {
+                'id': eid,
+                'title': title,
+                'start': start,
+                'end': end,
+                'location': location,
+                'notes': notes,
+                'roommate': {'id': rid, 'name': rm[0], 'color': rm[1]},
+            }
 
     def query_events(start: Optional[str], end: Optional[str]):
-        base = (
-            'SELECT e.id, e.title, e.start, e."end" as "end", e.location, e.notes, '
-            'e.roommate_id, r.name as roommate_name, r.color as roommate_color '
-            'FROM events e JOIN roommates r ON r.id = e.roommate_id'
-        )
+        base = f'SELECT {EVENT_COLUMNS} FROM events'
         args = []
         where = []
+        # Filter and sort on the integer epoch columns; the ISO text is only for display
         if start:
-            where.append('e."end" > ?')
-            args.append(start)
+            where.append('end_ts > ?')
+            args.append(iso_epoch(start))
         if end:
-            where.append('e.start < ?')
-            args.append(end)
-        sql = base + (' WHERE ' + ' AND '.join(where) if where else '') + ' ORDER BY e.start'
-        rows = db_query_all(sql, args)
-        return [event_row_to_dict(r) for r in rows]
+            where.append('start_ts < ?')
+            args.append(iso_epoch(end))
+        sql = base + (' WHERE ' + ' AND '.join(where) if where else '') + ' ORDER BY start_ts'
+        # Iterate the cursor directly so rows are converted as they are read
+        return event_rows_to_dicts(db_execute(sql, args, tuples=True))
 
     def find_conflicts(start: str, end: str, exclude_event_id: Optional[int] = None):
-        args = [start, end]
-        sql = (
-            'SELECT e.id, e.title, e.start, e."end" as "end", e.location, e.notes, '
-            'e.roommate_id, r.name as roommate_name, r.color as roommate_color '
-            'FROM events e JOIN roommates r ON r.id = e.roommate_id '
-            'WHERE e.start < ? AND e."end" > ?'
-        )
+        args = [iso_epoch(start), iso_epoch(end)]
+        sql = f'SELECT {EVENT_COLUMNS} FROM events WHERE start_ts < ? AND end_ts > ?'
+        if exclude_event_id is not None:
+            sql += ' AND id != ?'
+            args.append(exclude_event_id)
+        rows = db_execute(sql, args, tuples=True).fetchall()
+        return list(event_rows_to_dicts(rows))
+
+    def has_conflict(start: str, end: str, exclude_event_id: Optional[int] = None) -> bool:
+        # Same predicate as find_conflicts, but stops at the first overlapping row
+        args = [iso_epoch(start), iso_epoch(end)]
+        sql = 'SELECT 1 FROM events WHERE start_ts < ? AND end_ts > ?'
         if exclude_event_id is not None:
-            sql += ' AND e.id != ?'
+            sql += ' AND id != ?'
             args.append(exclude_event_id)
-        rows = db_query_all(sql, args)
-        return [event_row_to_dict(r) for r in rows]
+        return db_execute(f'SELECT EXISTS ({sql})', args, tuples=True).fetchone()[0] == 1
 
     @app.route('/api/events', methods=['GET'])
     def list_events():
@@ -337,7 +697,9 @@ def create_app():
             end = parse_iso(end) if end else None
         except ValueError:
             return jsonify({'error': 'invalid start or end ISO datetime'}), 400
-        return jsonify(query_events(start, end))
+        # Stream the array so large ranges are never fully materialized in memory
+        body = stream_with_context(_json_array_stream(query_events(start, end), sort_keys=app.json.sort_keys))
+        return Response(body, mimetype='application/json')
 
     @app.route('/api/events', methods=['POST'])
     def create_event():
@@ -352,7 +714,7 @@ def create_app():
 
         if not roommate_id:
             return jsonify({'error': 'roommate_id is required'}), 400
-        rm = db_query_one('SELECT id FROM roommates WHERE id=?', (roommate_id,))
+        rm = roommate_for(roommate_id)
         if not rm:
             return jsonify({'error': 'invalid roommate_id'}), 400
         try:
@@ -363,100 +725,92 @@ def create_app():
         if start >= end:
             return jsonify({'error': 'end must be after start'}), 400
 
-        conflicts = find_conflicts(end, start)  # Note we pass (new_end, new_start)
-        if conflicts and reject_on_conflict:
-            return jsonify({'error': 'conflict', 'conflicts': conflicts}), 409
-
-        if DB_MODE == 'pg':
-            cur = db_execute(
-                'INSERT INTO events(roommate_id, title, start, "end", location, notes) VALUES (?, ?, ?, ?, ?, ?) RETURNING id',
-                (roommate_id, title, start, end, location, notes)
-            )
-            eid = cur.fetchone()['id']
-            g.db.commit()
+        start_ts, end_ts = iso_epoch(start), iso_epoch(end)
+        insert = 'INSERT INTO events(roommate_id, title, start, "end", start_ts, end_ts, location, notes) '
+        values = (roommate_id, title, start, end, start_ts, end_ts, location, notes)
+        db_lock_events()
+        if reject_on_conflict:
+            # Overlap check and insert in one statement; no row back means the slot is taken.
+            # db_lock_events keeps a concurrent create from passing the same check on Postgres.
+            # Only the 409 payload needs the full conflict list.
+            # Note we pass (new_end, new_start), here and to find_conflicts
+            row = db_execute(
+                insert + 'SELECT ?, ?, ?, ?, ?, ?, ?, ? '
+                'WHERE NOT EXISTS (SELECT 1 FROM events WHERE start_ts < ? AND end_ts > ?) '
+                f'RETURNING {EVENT_COLUMNS}',
+                (*values, end_ts, start_ts), tuples=True
+            ).fetchone()
+            if row is None:
+                conflicts = find_conflicts(end, start)
+                g.db.rollback()  # release the events lock
+                return jsonify({'error': 'conflict', 'conflicts': conflicts}), 409
+            conflicts = []
         else:
-            cur = db_execute(
-                'INSERT INTO events(roommate_id, title, start, "end", location, notes) VALUES (?, ?, ?, ?, ?, ?)',
-                (roommate_id, title, start, end, location, notes)
-            )
-            g.db.commit()
-            eid = cur.lastrowid
-        row = db_query_one(
-            'SELECT e.id, e.title, e.start, e."end" as "end", e.location, e.notes, e.roommate_id, '
-            'r.name as roommate_name, r.color as roommate_color '
-            'FROM events e JOIN roommates r ON r.id = e.roommate_id WHERE e.id=?', (eid,)
-        )
-        return jsonify({'event': event_row_to_dict(row), 'conflicts': conflicts}), 201
+            conflicts = find_conflicts(end, start)
+            row = db_execute(
+                insert + f'VALUES (?, ?, ?, ?, ?, ?, ?, ?) RETURNING {EVENT_COLUMNS}', values, tuples=True
+            ).fetchone()
+        g.db.commit()
+        # Roommate name/color come from the in-memory map; no re-select needed
+        return jsonify({'event': next(event_rows_to_dicts([row])), 'conflicts': conflicts}), 201
 
     @app.route('/api/events/<int:eid>', methods=['PUT'])
     def update_event(eid):
-        row = db_query_one('SELECT id FROM events WHERE id=?', (eid,))
-        if not row:
-            return jsonify({'error': 'not found'}), 404
         data = request.get_json(force=True)
+        reject_on_conflict = bool(data.get('rejectOnConflict'))
         # Allow partial update
-        fields = []
+        mask = 0
+        for i, col in enumerate(_EVENT_UPDATE_COLUMNS):
+            if col in data:
+                mask |= 1 << i
+        if not mask:
+            return jsonify({'error': 'no fields to update'}), 400
+        # Values are appended in _EVENT_UPDATE_COLUMNS order to match _update_event_sql(mask)
         args = []
         if 'roommate_id' in data:
             roommate_id = data['roommate_id']
-            rm = g.db.execute('SELECT id FROM roommates WHERE id=?', (roommate_id,)).fetchone()
-            if not rm:
+            if not roommate_for(roommate_id):
                 return jsonify({'error': 'invalid roommate_id'}), 400
-            fields.append('roommate_id=?')
             args.append(roommate_id)
         if 'title' in data:
-            fields.append('title=?')
             args.append((data.get('title') or 'Interview').strip())
         if 'start' in data:
             try:
-                args.append(parse_iso(data['start']))
+                start = parse_iso(data['start'])
             except ValueError:
                 return jsonify({'error': 'invalid start'}), 400
-            fields.append('start=?')
+            args += (start, iso_epoch(start))
         if 'end' in data:
             try:
-                args.append(parse_iso(data['end']))
+                end = parse_iso(data['end'])
             except ValueError:
                 return jsonify({'error': 'invalid end'}), 400
-            fields.append('end=?')
+            args += (end, iso_epoch(end))
         if 'location' in data:
-            fields.append('location=?')
             args.append((data.get('location') or '').strip())
         if 'notes' in data:
-            fields.append('notes=?')
             args.append((data.get('notes') or '').strip())
 
-        if not fields:
-            return jsonify({'error': 'no fields to update'}), 400
-
-        # Fetch existing to validate time order if both present after update
-        existing = db_query_one('SELECT start, "end" as "end" FROM events WHERE id=?', (eid,))
-        new_start = None
-        new_end = None
-        for i, f in enumerate(fields):
-            if f == 'start=?':
-                new_start = args[i]
-            elif f == 'end=?':
-                new_end = args[i]
-        if new_start is None:
-            new_start = existing['start']
-        if new_end is None:
-            new_end = existing['end']
+        # Apply and read back in one statement; no row means the event does not exist.
+        # The explicit transaction lets an invalid resulting time range be rolled back.
+        db_begin()
+        db_lock_events()
+        row = db_execute(_update_event_sql(mask), (*args, eid), tuples=True).fetchone()
+        if row is None:
+            g.db.rollback()
+            return jsonify({'error': 'not found'}), 404
+        new_start, new_end = row[2], row[3]
         if new_start >= new_end:
+            g.db.rollback()
             return jsonify({'error': 'end must be after start'}), 400
-
-        # Quote reserved column name "end" in update fields
-        fields_q = [f.replace('end=?', '"end"=?') for f in fields]
-        db_execute(f'UPDATE events SET {", ".join(fields_q)} WHERE id=?', (*args, eid))
+        if reject_on_conflict and has_conflict(new_end, new_start, exclude_event_id=eid):
+            # Checked inside the transaction; only the 409 payload needs the full list
+            g.db.rollback()
+            return jsonify({'error': 'conflict', 'conflicts': find_conflicts(new_end, new_start, exclude_event_id=eid)}), 409
         g.db.commit()
         # Conflicts after update (exclude this event)
-        conflicts = find_conflicts(new_end, new_start, exclude_event_id=eid)
-        row = db_query_one(
-            'SELECT e.id, e.title, e.start, e."end" as "end", e.location, e.notes, e.roommate_id, '
-            'r.name as roommate_name, r.color as roommate_color '
-            'FROM events e JOIN roommates r ON r.id = e.roommate_id WHERE e.id=?', (eid,)
-        )
-        return jsonify({'event': event_row_to_dict(row), 'conflicts': conflicts})
+        conflicts = [] if reject_on_conflict else find_conflicts(new_end, new_start, exclude_event_id=eid)
+        return jsonify({'event': next(event_rows_to_dicts([row])), 'conflicts': conflicts})
 
     @app.route('/api/events/<int:eid>', methods=['DELETE'])
     def delete_event(eid):
@@ -469,17 +823,42 @@ def create_app():
     @app.route('/<path:path>')
     def static_proxy(path):
         # Serve other static assets
-        return send_from_directory(app.static_folder, path)
+        # Cached for STATIC_MAX_AGE, then revalidated with If-None-Match / If-Modified-Since
+        return send_from_directory(app.static_folder, path, max_age=STATIC_MAX_AGE, conditional=True)
 
     return app
 
 
+# Seeded into an empty roommates table on first start
+DEFAULT_ROOMMATES = [
+    ('Vatsal',  '#3778C2'),
+    ('Ganesh',  '#EF6C33'),
+    ('Jenil',   '#2BAF2B'),
+    ('Shibin',  '#8E44AD'),
+    ('Jeevan',  '#C0392B'),
+    ('Sarwesh', '#16A085'),
+    ('Tushar',  '#D35400'),
+    ('Rajeev',  '#7F8C8D'),
+    ('Vineet',  '#F1C40F'),
+    ('Prakhar', '#1ABC9C'),
+    ('Srinidhi','#9B59B6'),
+]
+# One statement for the seed: the NOT EXISTS keeps it a no-op once any roommate exists (so
+# renamed or deleted defaults stay that way), and ON CONFLICT makes concurrent first starts safe.
+_SEED_ROOMMATES_SQL = (
+    'WITH seed(name, color) AS (VALUES ' + ', '.join(['(?, ?)'] * len(DEFAULT_ROOMMATES)) + ') '
+    'INSERT INTO roommates(name, color) SELECT name, color FROM seed '
+    'WHERE NOT EXISTS (SELECT 1 FROM roommates) ON CONFLICT(name) DO NOTHING'
+)
+_SEED_ROOMMATES_ARGS = tuple(v for row in DEFAULT_ROOMMATES for v in row)
+
+
 def init_db():
     if DB_MODE == 'sqlite':
-        with closing(sqlite3.connect(DB_PATH)) as db:
+        # Same tuning as pooled connections; also switches the file to WAL up front
+        with closing(_init_sqlite_conn(sqlite3.connect(DB_PATH))) as db:
             db.executescript(
                 '''
-                PRAGMA foreign_keys = ON;
                 CREATE TABLE IF NOT EXISTS roommates (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT NOT NULL UNIQUE,
@@ -491,31 +870,53 @@ def init_db():
                     title TEXT NOT NULL,
                     start TEXT NOT NULL,
                     end TEXT NOT NULL,
+                    start_ts INTEGER NOT NULL,
+                    end_ts INTEGER NOT NULL,
                     location TEXT,
                     notes TEXT,
                     FOREIGN KEY(roommate_id) REFERENCES roommates(id) ON DELETE CASCADE
                 );
                 '''
             )
+            # Databases created before the epoch columns existed: add them, then backfill
+            # (naive values read as UTC, matching iso_epoch)
+            def has_epoch_columns():
+                return any(r[1] == 'start_ts' for r in db.execute('PRAGMA table_info(events)'))
+
+            if not has_epoch_columns():
+                # Several workers may upgrade the same file at once: take the write lock, then check
+                # again so only the first one migrates. One transaction, so a failed backfill check
+                # also undoes the ALTERs and the next boot retries.
+                db.execute('BEGIN IMMEDIATE')
+                if not has_epoch_columns():
+                    # SQLite cannot add a NOT NULL column without a default, so check the backfill instead
+                    db.execute('ALTER TABLE events ADD COLUMN start_ts INTEGER')
+                    db.execute('ALTER TABLE events ADD COLUMN end_ts INTEGER')
+                    db.execute(
+                        "UPDATE events SET start_ts = CAST(strftime('%s', start) AS INTEGER), "
+                        "end_ts = CAST(strftime('%s', \"end\") AS INTEGER)"
+                    )
+                    missing = db.execute(
+                        'SELECT COUNT(*) FROM events WHERE start_ts IS NULL OR end_ts IS NULL'
+                    ).fetchone()[0]
+                    if missing:
+                        db.rollback()
+                        raise RuntimeError(f'{missing} event(s) have start/end values that could not be converted to epoch seconds')
+            db.executescript(
+                '''
+                -- Range filters and ordering use the integer epoch columns
+                CREATE INDEX IF NOT EXISTS idx_events_ts ON events(start_ts, end_ts);
+                CREATE INDEX IF NOT EXISTS idx_events_end_ts ON events(end_ts);
+                CREATE INDEX IF NOT EXISTS idx_events_roommate ON events(roommate_id);
+                '''
+            )
             # Seed roommates if empty
-            cur = db.execute('SELECT COUNT(*) as c FROM roommates')
-            c = cur.fetchone()[0]
-            if c == 0:
-                defaults = [
-                    ('Vatsal',  '#3778C2'),
-                    ('Ganesh',  '#EF6C33'),
-                    ('Jenil',   '#2BAF2B'),
-                    ('Shibin',  '#8E44AD'),
-                    ('Jeevan',  '#C0392B'),
-                    ('Sarwesh', '#16A085'),
-                    ('Tushar',  '#D35400'),
-                    ('Rajeev',  '#7F8C8D'),
-                    ('Vineet',  '#F1C40F'),
-                    ('Prakhar', '#1ABC9C'),
-                    ('Srinidhi','#9B59B6'),
-                ]
-                db.executemany('INSERT INTO roommates(name, color) VALUES (?,?)', defaults)
+            db.execute(_SEED_ROOMMATES_SQL, _SEED_ROOMMATES_ARGS)
             db.commit()
+            # Refresh planner statistics so the events indexes are chosen; analysis_limit keeps
+            # this a sampled, bounded pass even on large databases.
+            db.execute('PRAGMA analysis_limit = 400')
+            db.execute('ANALYZE')
     else:
         # Postgres init (uses same fallback logic)
         with closing(_pg_connect(DATABASE_URL)) as db:
@@ -534,28 +935,38 @@ def init_db():
                         title TEXT NOT NULL,
                         start TEXT NOT NULL,
                         "end" TEXT NOT NULL,
+                        start_ts BIGINT NOT NULL,
+                        end_ts BIGINT NOT NULL,
                         location TEXT,
                         notes TEXT
                     );
                 ''')
+                # Older databases: add and backfill the epoch columns (naive values read as UTC).
+                # Checked first so a normal boot never takes the ALTER TABLE lock.
+                def has_epoch_columns():
+                    cur.execute('''
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_schema = current_schema() AND table_name = 'events' AND column_name = 'start_ts'
+                    ''')
+                    return cur.fetchone() is not None
+
+                if not has_epoch_columns():
+                    # Several workers may upgrade at once: serialize on the events lock and check
+                    # again, so later workers find the columns the first one committed
+                    cur.execute('SELECT pg_advisory_xact_lock(%s)', (_PG_EVENTS_LOCK_KEY,))
+                    if not has_epoch_columns():
+                        cur.execute('ALTER TABLE events ADD COLUMN IF NOT EXISTS start_ts BIGINT, ADD COLUMN IF NOT EXISTS end_ts BIGINT')
+                        cur.execute('''
+                            UPDATE events
+                            SET start_ts = EXTRACT(EPOCH FROM replace(start, 'Z', '')::timestamp)::bigint,
+                                end_ts = EXTRACT(EPOCH FROM replace("end", 'Z', '')::timestamp)::bigint
+                        ''')
+                        cur.execute('ALTER TABLE events ALTER COLUMN start_ts SET NOT NULL, ALTER COLUMN end_ts SET NOT NULL')
+                cur.execute('CREATE INDEX IF NOT EXISTS idx_events_ts ON events(start_ts, end_ts)')
+                cur.execute('CREATE INDEX IF NOT EXISTS idx_events_end_ts ON events(end_ts)')
+                cur.execute('CREATE INDEX IF NOT EXISTS idx_events_roommate ON events(roommate_id)')
                 # Seed if empty
-                cur.execute('SELECT COUNT(*) AS c FROM roommates')
-                c = cur.fetchone()['c']
-                if c == 0:
-                    defaults = [
-                        ('Vatsal',  '#3778C2'),
-                        ('Ganesh',  '#EF6C33'),
-                        ('Jenil',   '#2BAF2B'),
-                        ('Shibin',  '#8E44AD'),
-                        ('Jeevan',  '#C0392B'),
-                        ('Sarwesh', '#16A085'),
-                        ('Tushar',  '#D35400'),
-                        ('Rajeev',  '#7F8C8D'),
-                        ('Vineet',  '#F1C40F'),
-                        ('Prakhar', '#1ABC9C'),
-                        ('Srinidhi','#9B59B6'),
-                    ]
-                    cur.executemany('INSERT INTO roommates(name, color) VALUES (%s,%s)', defaults)
+                cur.execute(_adapt_sql(_SEED_ROOMMATES_SQL), _SEED_ROOMMATES_ARGS)
             db.commit()
 
 # Expose a module-level WSGI variable for platforms expecting 'app:app'